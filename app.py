@@ -1,5 +1,7 @@
 import lgpio
-import Adafruit_SSD1306
+import adafruit_ssd1306
+import board
+import busio
 import time
 from PIL import Image, ImageDraw, ImageFont
 import atexit
@@ -23,16 +25,8 @@ def safe_gpio_claim_output(handle, pin):
         lgpio.gpio_claim_output(handle, pin)
         print(f"✅ Output pin {pin} ready")
     except lgpio.error as e:
-        print(f"⚠️ GPIO {pin} busy — trying to recover...")
-        try:
-            lgpio.gpiochip_close(handle)
-            time.sleep(0.2)
-            handle = lgpio.gpiochip_open(CHIP)
-            lgpio.gpio_claim_output(handle, pin)
-            print(f"✅ Reclaimed GPIO {pin}")
-        except Exception as e2:
-            print(f"❌ Could not reclaim GPIO {pin}: {e2}")
-    return handle
+        # h is freshly opened, so a busy line belongs to another process
+        print(f"⚠️ GPIO {pin} busy or already in use: {e}")
 
 def safe_gpio_claim_input(handle, pin):
     try:
@@ -42,18 +36,37 @@ def safe_gpio_claim_input(handle, pin):
         print(f"⚠️ GPIO {pin} busy or already in use")
 
 # Initialize pins
-h = safe_gpio_claim_output(h, TRIG)
+safe_gpio_claim_output(h, TRIG)
 safe_gpio_claim_input(h, ECHO)
-h = safe_gpio_claim_output(h, BUZZER)
+safe_gpio_claim_output(h, BUZZER)
+
+# -----------------------------
+# I2C BUS SPEED CHECK
+# -----------------------------
+# OLED, MLX90614 and TCS34725 all support 400 kHz fast mode, but the Pi
+# boots i2c_arm at 100 kHz unless config.txt says otherwise.
+I2C_CLOCK_PATH = "/sys/class/i2c-adapter/i2c-1/of_node/clock-frequency"
+
+def check_i2c_speed():
+    try:
+        with open(I2C_CLOCK_PATH, "rb") as f:
+            hz = int.from_bytes(f.read(4), "big")
+    except OSError as e:
+        print(f"⚠️ Could not read I2C bus speed: {e}")
+        return
+    if hz < 400000:
+        print(f"⚠️ I2C bus at {hz // 1000} kHz — run 'sudo scripts/setup_i2c.sh' and reboot")
+    else:
+        print(f"✅ I2C bus at {hz // 1000} kHz")
+
+check_i2c_speed()
 
 # -----------------------------
 # OLED DISPLAY SETUP
 # -----------------------------
 try:
-    disp = Adafruit_SSD1306.SSD1306_128_64(rst=None)
-    disp.begin()
-    disp.clear()
-    disp.display()
+    i2c = busio.I2C(board.SCL, board.SDA)
+    disp = adafruit_ssd1306.SSD1306_I2C(128, 64, i2c)
 
     width = disp.width
     height = disp.height
@@ -63,7 +76,7 @@ try:
     draw.text((0, 0), "Smart Surface Project", font=font, fill=255)
     draw.text((0, 20), "Initializing...", font=font, fill=255)
     disp.image(image)
-    disp.display()
+    disp.show()
     print("✅ OLED initialized successfully")
 
 except Exception as e:
@@ -9,6 +9,8 @@ import adafruit_mlx90614
 import adafruit_tcs34725
 import signal
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # ====================================
 # SMART SURFACE DIAGNOSTIC SCRIPT
@@ -25,20 +27,30 @@ BUTTON = 17
 CHIP = 0
 h = lgpio.gpiochip_open(CHIP)
 lgpio.gpio_claim_output(h, TRIG)
-lgpio.gpio_claim_input(h, ECHO)
+lgpio.gpio_claim_alert(h, ECHO, lgpio.BOTH_EDGES)
 lgpio.gpio_claim_output(h, BUZZER)
-lgpio.gpio_claim_input(h, BUTTON)
+lgpio.gpio_claim_alert(h, BUTTON, lgpio.FALLING_EDGE)
 
 print("\n=== SMART SURFACE PROJECT INITIALIZATION ===")
 
 # ====================================
-# OLED SETUP
+# I2C BUS (shared by OLED, MLX90614, TCS34725)
 # ====================================
+# A missing or disabled bus must not stop the GPIO checks; the I2C
+# devices below are then reported as not detected.
 try:
     i2c = busio.I2C(board.SCL, board.SDA)
+except Exception as e:
+    i2c = None
+    print(f"❌ I2C bus not available: {e}")
+
+# ====================================
+# OLED SETUP
+# ====================================
+try:
+    if i2c is None:
+        raise OSError("no I2C bus")
     disp = adafruit_ssd1306.SSD1306_I2C(128, 64, i2c, addr=0x3C)
-    disp.fill(0)
-    disp.show()
 
     width = disp.width
     height = disp.height
@@ -66,6 +78,8 @@ except Exception as e:
 # MLX90614 SENSOR SETUP
 # ====================================
 try:
+    if i2c is None:
+        raise OSError("no I2C bus")
     mlx = adafruit_mlx90614.MLX90614(i2c)
     obj_temp = mlx.object_temperature
     amb_temp = mlx.ambient_temperature
@@ -78,9 +92,14 @@ except Exception as e:
 # TCS34725 COLOR SENSOR SETUP
 # ====================================
 try:
+    if i2c is None:
+        raise OSError("no I2C bus")
     tcs = adafruit_tcs34725.TCS34725(i2c)
     tcs.integration_time = 100
     tcs.gain = 4
+    # Stay powered so later reads are one block read, not a 100 ms
+    # power-up-and-integrate cycle each
+    tcs.active = True
     color = tcs.color_rgb_bytes
     print(f"✅ TCS34725 OK - RGB: {color}")
 except Exception as e:
@@ -99,22 +118,61 @@ print("✅ Buzzer OK")
 # ====================================
 # ULTRASONIC FUNCTION
 # ====================================
+# ECHO is read through gpiochip line events: the kernel timestamps each
+# edge and lgpio's alert thread hands them over, so nothing polls the pin.
+echo_ticks = {}
+echo_done = threading.Event()
+
+def on_echo_edge(chip, gpio, level, tick):
+    if level == 1:
+        echo_ticks["rise"] = tick
+    elif level == 0 and "rise" in echo_ticks:
+        echo_ticks["fall"] = tick
+        echo_done.set()
+
+echo_cb = lgpio.callback(h, ECHO, lgpio.BOTH_EDGES, on_echo_edge)
+
+# Button presses (active LOW) come in as falling-edge events too
+button_pressed = threading.Event()
+button_cb = lgpio.callback(h, BUTTON, lgpio.FALLING_EDGE, lambda *_: button_pressed.set())
+
 def get_distance():
-    lgpio.gpio_write(h, TRIG, 1)
-    time.sleep(0.00001)
-    lgpio.gpio_write(h, TRIG, 0)
+    echo_ticks.clear()
+    echo_done.clear()
+    lgpio.tx_pulse(h, TRIG, 10, 10, 0, 1)
+
+    if not echo_done.wait(0.05):
+        return None
 
-    start_time = time.time()
-    while lgpio.gpio_read(h, ECHO) == 0:
-        start_time = time.time()
+    elapsed_ns = echo_ticks["fall"] - echo_ticks["rise"]
+    return elapsed_ns * (34300 / 2e9)
 
-    stop_time = time.time()
-    while lgpio.gpio_read(h, ECHO) == 1:
-        stop_time = time.time()
+# HC-SR04 minimum between triggers, so one ping's echo can't land in the next
+PING_INTERVAL = 0.06
 
-    elapsed = stop_time - start_time
-    distance = (elapsed * 34300) / 2
-    return round(distance, 2)
+def get_distances(count):
+    # Pace pings to fixed deadlines from t0, as live_plot's sampler does
+    readings = []
+    t0 = time.monotonic()
+    for i in range(count):
+        d = get_distance()
+        if d is not None:
+            readings.append(d)
+        if i < count - 1:
+            time.sleep(max(0, t0 + (i + 1) * PING_INTERVAL - time.monotonic()))
+    return readings
+
+# ====================================
+# I2C SENSOR READS
+# ====================================
+# The I2C sensors share no hardware with the ultrasonic pins, so they are
+# read on a worker thread while the echo pings run.
+i2c_pool = ThreadPoolExecutor(max_workers=1)
+
+def read_i2c_sensors():
+    temps = (mlx.object_temperature, mlx.ambient_temperature) if mlx else None
+    rgb = tcs.color_rgb_bytes if tcs else None
+    return temps, rgb
 
 # ====================================
 # BUTTON HANDLER
@@ -122,35 +180,40 @@ def get_distance():
 def run_diagnostics():
     oled_message("Running Tests...", "")
     print("\n=== STARTING DIAGNOSTIC TESTS ===")
+    i2c_job = i2c_pool.submit(read_i2c_sensors)
 
     # --- Ultrasonic ---
     try:
-        readings = [get_distance() for _ in range(5)]
-        avg_dist = sum(readings) / len(readings)
-        print(f"📏 Ultrasonic Avg: {avg_dist:.2f} cm")
+        readings = get_distances(5)
+        if readings:
+            avg_dist = sum(readings) / len(readings)
+            print(f"📏 Ultrasonic Avg: {avg_dist:.2f} cm")
+        else:
+            avg_dist = None
+            print("⚠️ Ultrasonic: no echo received")
     except Exception as e:
         avg_dist = None
         print(f"❌ Ultrasonic error: {e}")
 
+    temps, rgb = i2c_job.result()
+
     # --- MLX90614 ---
-    if mlx:
-        obj_temp = mlx.object_temperature
-        amb_temp = mlx.ambient_temperature
+    if temps:
+        obj_temp, amb_temp = temps
         print(f"🌡️ IR Temp: Obj {obj_temp:.2f}°C | Amb {amb_temp:.2f}°C")
     else:
         print("⚠️ MLX90614 not detected")
 
     # --- TCS34725 ---
-    if tcs:
-        r, g, b = tcs.color_rgb_bytes
+    if rgb:
+        r, g, b = rgb
         print(f"🎨 Color RGB: {r}, {g}, {b}")
     else:
         print("⚠️ TCS34725 not detected")
 
     oled_message("Diagnostics Done", "Check Console")
-    lgpio.gpio_write(h, BUZZER, 1)
-    time.sleep(0.3)
-    lgpio.gpio_write(h, BUZZER, 0)
+    # lgpio times the 300 ms beep itself, so the loop isn't held up
+    lgpio.tx_pulse(h, BUZZER, 300000, 100000, 0, 1)
 
     print("✅ TEST COMPLETE\n")
 
@@ -178,8 +241,9 @@ print("\n=== SYSTEM READY ===")
 print("👉 Press button on GPIO17 to start diagnostics")
 
 while True:
-    if lgpio.gpio_read(h, BUTTON) == 0:  # Active LOW button
-        run_diagnostics()
-        oled_message("Press Button", "for next test")
-        time.sleep(1.5)
-    time.sleep(0.1)
+    button_pressed.wait()
+    run_diagnostics()
+    oled_message("Press Button", "for next test")
+    time.sleep(1.5)
+    # drop presses made while the test was running
+    button_pressed.clear()
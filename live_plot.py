@@ -1,3 +1,4 @@
+import time
 import matplotlib.pyplot as plt
 
 def plot_readings(readings, title):
@@ -10,14 +11,30 @@ def plot_readings(readings, title):
     plt.tight_layout()
     plt.show()  # or plt.savefig("shape_plot.png") to save
 
-def test_shape():
+def mean_stdev(readings):
+    # Welford: mean and sample std-dev in one pass, no statistics module
+    n, mean, m2 = 0, 0.0, 0.0
+    for x in readings:
+        n += 1
+        delta = x - mean
+        mean += delta / n
+        m2 += delta * (x - mean)
+    return mean, (m2 / (n - 1)) ** 0.5
+
+def sample_readings(count, interval):
+    # Sleep to fixed deadlines from t0 so ping time and sleep overshoot
+    # don't add up across the run
     readings = []
-    for _ in range(15):
+    t0 = time.monotonic()
+    for i in range(count):
         d,_ = ultrasonic_distance()
         readings.append(d)
-        time.sleep(0.2)
-    mean_val = statistics.mean(readings)
-    std_dev = statistics.stdev(readings)
+        time.sleep(max(0, t0 + (i + 1) * interval - time.monotonic()))
+    return readings
+
+def test_shape():
+    readings = sample_readings(15, 0.06)
+    mean_val, std_dev = mean_stdev(readings)
     shape = "Flat" if std_dev < 0.5 else "Curved" if std_dev < 2 else "Irregular"
     obj_temp = mlx.object_temperature
     amb_temp = mlx.ambient_temperature
@@ -37,12 +54,8 @@ def test_shape():
     plot_readings(readings, "Shape Test Readings")
 
 def test_material():
-    readings = []
-    for _ in range(15):
-        d,_ = ultrasonic_distance()
-        readings.append(d)
-        time.sleep(0.2)
-    std_dev = statistics.stdev(readings)
+    readings = sample_readings(15, 0.06)
+    _, std_dev = mean_stdev(readings)
     material = "Absorbing" if std_dev > 1 else "Reflective"
     obj_temp = mlx.object_temperature
     amb_temp = mlx.ambient_temperature
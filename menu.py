@@ -1,8 +1,11 @@
-import time, statistics, lgpio, board, busio
+import time, queue, threading, lgpio, board, busio
+import numpy as np
+from collections import deque
 from adafruit_mlx90614 import MLX90614
 import adafruit_tcs34725
 import adafruit_ssd1306
 from PIL import Image, ImageDraw, ImageFont
+from oled_text import draw_text
 
 # -----------------------------
 # GPIO Configuration
@@ -18,25 +21,53 @@ print("\n=== SMART SURFACE PROJECT INITIALIZATION ===")
 # Open GPIO chip
 h = lgpio.gpiochip_open(CHIP)
 lgpio.gpio_claim_output(h, TRIG)
-lgpio.gpio_claim_input(h, ECHO)
+lgpio.gpio_claim_alert(h, ECHO, lgpio.BOTH_EDGES)
 lgpio.gpio_claim_output(h, BUZZER)
-lgpio.gpio_claim_input(h, BUTTON, lgpio.SET_PULL_UP)
+lgpio.gpio_claim_alert(h, BUTTON, lgpio.FALLING_EDGE, lgpio.SET_PULL_UP)
+
+# ECHO edges are timestamped by the kernel (ns ticks); the callback only
+# records them, so no Python code spins while the pulse is in flight.
+# Completed (rise, fall) pairs land in a ring buffer so a whole burst of
+# pings can be collected and decoded afterwards.
+echo_rise = {}
+echo_pulses = deque(maxlen=64)
+echo_done = threading.Event()
+
+
+def on_echo_edge(chip, gpio, level, tick):
+    if level == 1:
+        echo_rise["tick"] = tick
+    elif level == 0 and "tick" in echo_rise:
+        echo_pulses.append((echo_rise.pop("tick"), tick))
+        echo_done.set()
+
+
+echo_cb = lgpio.callback(h, ECHO, lgpio.BOTH_EDGES, on_echo_edge)
+
+# The button is active low; its falling edge arrives the same way, so
+# waiting for a press is a blocking Event.wait instead of a read loop.
+button_pressed = threading.Event()
+button_cb = lgpio.callback(h, BUTTON, lgpio.FALLING_EDGE, lambda *_: button_pressed.set())
 
 # -----------------------------
 # I2C + Sensor Setup
 # -----------------------------
 i2c = busio.I2C(board.SCL, board.SDA)
+# Blinka's busio try_lock is not atomic, so OLED flushes on the output
+# thread and sensor reads on the main thread take this lock instead.
+i2c_lock = threading.Lock()
 
 # MLX90614 (IR Temp)
 mlx = MLX90614(i2c)
 
 # TCS34725 (Color)
+# Left powered and integrating so each colour read is a single 8-byte
+# block read, not a power-up/wait/power-down cycle.
 tcs = adafruit_tcs34725.TCS34725(i2c)
+tcs.active = True
 
 # OLED
 oled = adafruit_ssd1306.SSD1306_I2C(128, 64, i2c)
-oled.fill(0)
-oled.show()
 font = ImageFont.load_default()
 image = Image.new("1", (128, 64))
 draw = ImageDraw.Draw(image)
@@ -47,51 +78,132 @@ print("✅ OLED initialized successfully")
 # -----------------------------
 # Helper Functions
 # -----------------------------
+# OLED flushes are slow and nothing waits on them, so they run in order on
+# one background thread instead of stalling the caller.
+output_queue = queue.Queue()
+
+
+def output_worker():
+    while True:
+        job, args = output_queue.get()
+        try:
+            job(*args)
+        except Exception as e:
+            print(f"⚠️ Output error: {e}")
+
+
+threading.Thread(target=output_worker, daemon=True).start()
+
+
 def beep(times=1):
-    for _ in range(times):
-        lgpio.gpio_write(h, BUZZER, 1)
-        time.sleep(0.2)
-        lgpio.gpio_write(h, BUZZER, 0)
-        time.sleep(0.1)
+    # 200 ms on / 100 ms off, timed by lgpio; calls queue up on the pin
+    lgpio.tx_pulse(h, BUZZER, 200000, 100000, 0, times)
+
+
+def wait_for_beep():
+    # beep() returns at once; measuring while it sounds would overlap the pings
+    while lgpio.tx_busy(h, BUZZER, lgpio.TX_PWM):
+        time.sleep(0.01)
+
+
+# The queue is FIFO, so the last lines queued are what the panel ends up
+# showing; an identical frame would just repeat a full I2C flush. A failed
+# draw clears it so the same lines can be sent again.
+last_oled_lines = None
 
 
 def oled_display(line1, line2="", line3=""):
+    global last_oled_lines
+    lines = (line1, line2, line3)
+    if lines == last_oled_lines:
+        return
+    last_oled_lines = lines
+    output_queue.put((oled_draw, lines))
+
+
+def pack_frame(img):
+    # SSD1306 pages are 8 rows tall with the top row in bit 0, one byte per
+    # column; numpy builds that layout instead of framebuf's per-pixel loop.
+    pixels = np.asarray(img, dtype=bool).reshape(8, 8, 128)
+    return np.packbits(pixels.transpose(0, 2, 1), axis=2, bitorder="little").reshape(8, 128)
+
+
+# What the panel currently shows, one row per page; SSD1306_I2C.__init__
+# leaves it blank. Only the span of pages that differ from it is sent, so
+# a changed value line costs one or two 128-byte pages instead of the
+# whole 1 KB frame.
+oled_frame = np.zeros((8, 128), dtype=np.uint8)
+
+# One transmit buffer for every flush: the 0x40 data prefix followed by up
+# to eight pages, filled in place through a numpy view.
+oled_tx = bytearray(1 + 8 * 128)
+oled_tx[0] = 0x40
+oled_tx_pages = np.frombuffer(oled_tx, dtype=np.uint8, offset=1).reshape(8, 128)
+
+
+def oled_draw(line1, line2, line3):
+    global last_oled_lines
     draw.rectangle((0, 0, 128, 64), outline=0, fill=0)
-    draw.text((0, 5), line1, font=font, fill=255)
-    draw.text((0, 25), line2, font=font, fill=255)
-    draw.text((0, 45), line3, font=font, fill=255)
-    oled.image(image)
-    oled.show()
+    draw_text(image, font, (0, 5), line1)
+    draw_text(image, font, (0, 25), line2)
+    draw_text(image, font, (0, 45), line3)
+    frame = pack_frame(image)
+    dirty = np.flatnonzero((frame != oled_frame).any(axis=1))
+    if dirty.size == 0:
+        return
+    first, last = int(dirty[0]), int(dirty[-1])
+    pages = last - first + 1
+    oled_tx_pages[:pages] = frame[first:last + 1]
+    try:
+        with i2c_lock:
+            # column 0-127, pages first..last, then the data in one write
+            for cmd in (0x21, 0, 127, 0x22, first, last):
+                oled.write_cmd(cmd)
+            with oled.i2c_device:
+                oled.i2c_device.write(oled_tx, end=1 + pages * 128)
+    except OSError:
+        last_oled_lines = None
+        raise
+    oled_frame[first:last + 1] = frame[first:last + 1]
+
+
+def pulse_to_cm(rise, fall):
+    return (fall - rise) * (17150 / 1e9)
 
 
 def measure_distance():
-    lgpio.gpio_write(h, TRIG, 1)
-    time.sleep(0.00001)
-    lgpio.gpio_write(h, TRIG, 0)
+    echo_pulses.clear()
+    echo_done.clear()
+    lgpio.tx_pulse(h, TRIG, 10, 10, 0, 1)
+
+    if not echo_done.wait(0.04):
+        return None
+    return pulse_to_cm(*echo_pulses[-1])
+
 
-    pulse_start = time.time()
-    timeout = time.time() + 0.04
-    while lgpio.gpio_read(h, ECHO) == 0:
-        pulse_start = time.time()
-        if time.time() > timeout:
-            return None
+# HC-SR04 datasheet minimum between triggers; a full-range echo plus its
+# ringing has died away by then.
+PING_INTERVAL = 0.06
 
-    pulse_end = time.time()
-    while lgpio.gpio_read(h, ECHO) == 1:
-        pulse_end = time.time()
-        if time.time() > timeout:
-            return None
 
-    pulse_duration = pulse_end - pulse_start
-    distance = pulse_duration * 17150
-    return round(distance, 2)
+def measure_distances(count, interval=PING_INTERVAL):
+    # lgpio emits the whole TRIG burst itself; Python just waits it out
+    echo_pulses.clear()
+    period_us = int(interval * 1_000_000)
+    lgpio.tx_pulse(h, TRIG, 10, period_us - 10, 0, count)
+    time.sleep(count * interval + 0.04)
+    # Missed echoes stay NaN so callers can see how many pings came back
+    ticks = np.array(list(echo_pulses)[:count], dtype=np.int64).reshape(-1, 2)
+    readings = np.full(count, np.nan, dtype=np.float32)
+    readings[:len(ticks)] = (ticks[:, 1] - ticks[:, 0]) * (17150 / 1e9)
+    return readings
 
 
 def wait_for_button():
     oled_display("Waiting for button", "Press to start test")
     print("➡️ Waiting for button press...")
-    while lgpio.gpio_read(h, BUTTON) == 1:
-        time.sleep(0.05)
+    button_pressed.clear()
+    button_pressed.wait()
     time.sleep(0.3)
     print("✅ Button pressed!")
 
@@ -100,25 +212,47 @@ def speed_of_sound(temp):
     return 331 + (0.6 * temp)
 
 
+def read_sensor(name, read):
+    # A NACK shows as N/A on the menu instead of ending the main loop
+    try:
+        with i2c_lock:
+            return read()
+    except OSError as e:
+        print(f"⚠️ {name} read failed: {e}")
+        return None
+
+
+def read_temps():
+    return read_sensor("temps", lambda: (mlx.object_temperature, mlx.ambient_temperature))
+
+
+def read_rgb():
+    return read_sensor("rgb", lambda: tcs.color_rgb_bytes)
+
+
 # -----------------------------
 # Sensor Status Display
 # -----------------------------
 def show_menu():
-    obj_temp = mlx.object_temperature
-    amb_temp = mlx.ambient_temperature
-    rgb = tcs.color_rgb_bytes
-    speed = speed_of_sound(amb_temp)
-    oled_display(
-        "Select Option:",
-        f"Obj:{obj_temp:.1f}C Amb:{amb_temp:.1f}C",
-        f"Speed:{speed:.1f}m/s RGB:{rgb}"
-    )
+    temps = read_temps()
+    rgb = read_rgb()
+    if temps:
+        obj_temp, amb_temp = temps
+        speed = speed_of_sound(amb_temp)
+        temp_line = f"Obj:{obj_temp:.1f}C Amb:{amb_temp:.1f}C"
+        speed_line = f"Speed:{speed:.1f}m/s"
+    else:
+        temp_line, speed_line = "Temp: N/A", "Speed: N/A"
+    oled_display("Select Option:", temp_line, f"{speed_line} RGB:{rgb or 'N/A'}")
     print("\n=== MAIN MENU ===")
     print(f"1. Check Distance")
     print(f"2. Check Shape (15 readings)")
     print(f"3. Check Material (15 readings)")
-    print(f"Obj Temp: {obj_temp:.1f}°C | Amb Temp: {amb_temp:.1f}°C | Speed: {speed:.2f} m/s")
-    print(f"Color RGB: {rgb}")
+    if temps:
+        print(f"Obj Temp: {obj_temp:.1f}°C | Amb Temp: {amb_temp:.1f}°C | Speed: {speed:.2f} m/s")
+    else:
+        print("Obj Temp: N/A | Amb Temp: N/A | Speed: N/A")
+    print(f"Color RGB: {rgb or 'N/A'}")
 
 
 # -----------------------------
@@ -127,11 +261,12 @@ def show_menu():
 def test_distance():
     wait_for_button()
     beep(1)
+    wait_for_beep()
     dist = measure_distance()
     oled_display("Measuring...", "")
     if dist:
-        oled_display(f"Distance: {dist} cm")
-        print(f"📏 Distance: {dist} cm")
+        oled_display(f"Distance: {dist:.2f} cm")
+        print(f"📏 Distance: {dist:.2f} cm")
     else:
         oled_display("Distance: N/A")
     beep(2)
@@ -140,49 +275,48 @@ def test_distance():
 def test_shape():
     wait_for_button()
     beep(1)
-    readings = []
-    for _ in range(15):
-        d = measure_distance()
-        if d: readings.append(d)
-        time.sleep(0.1)
-    if readings:
-        mean_val = statistics.mean(readings)
-        std_dev = statistics.stdev(readings)
+    wait_for_beep()
+    readings = measure_distances(15)
+    echoes = np.count_nonzero(~np.isnan(readings))
+    if echoes > 1:
+        std_dev = float(np.nanstd(readings, ddof=1))
         shape = "Flat" if std_dev < 1 else "Curved" if std_dev < 3 else "Irregular"
         oled_display(f"Shape: {shape}", f"SD:{std_dev:.2f}")
-        print(f"📊 Shape: {shape}, SD:{std_dev:.2f}")
+        print(f"📊 Shape: {shape}, SD:{std_dev:.2f} ({echoes}/{readings.size} echoes)")
     beep(2)
 
 
 def test_material():
     wait_for_button()
     beep(1)
-    readings = []
-    for _ in range(15):
-        d = measure_distance()
-        if d: readings.append(d)
-        time.sleep(0.1)
-    if readings:
-        mean_val = statistics.mean(readings)
-        std_dev = statistics.stdev(readings)
+    wait_for_beep()
+    readings = measure_distances(15)
+    echoes = np.count_nonzero(~np.isnan(readings))
+    if echoes > 1:
+        std_dev = float(np.nanstd(readings, ddof=1))
         material = "Absorbing" if std_dev > 3 else "Reflective"
         oled_display(f"Material: {material}", f"SD:{std_dev:.2f}")
-        print(f"🧱 Material: {material}, SD:{std_dev:.2f}")
+        print(f"🧱 Material: {material}, SD:{std_dev:.2f} ({echoes}/{readings.size} echoes)")
     beep(2)
 
 
 # -----------------------------
 # Main Loop
 # -----------------------------
-while True:
-    show_menu()
-    choice = input("\nEnter choice (1-3): ").strip()
-    if choice == "1":
-        test_distance()
-    elif choice == "2":
-        test_shape()
-    elif choice == "3":
-        test_material()
-    else:
-        print("❌ Invalid option.")
-    time.sleep(1)
+def main():
+    while True:
+        show_menu()
+        choice = input("\nEnter choice (1-3): ").strip()
+        if choice == "1":
+            test_distance()
+        elif choice == "2":
+            test_shape()
+        elif choice == "3":
+            test_material()
+        else:
+            print("❌ Invalid option.")
+        time.sleep(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+from functools import lru_cache
+from PIL import Image, ImageDraw
+
+# Whole lines are rasterised once and pasted afterwards. Pasting glyph by
+# glyph does not reproduce draw.text: Pillow shifts a line whose bbox
+# starts left of the origin ("/", "(", "x" ...), so only a full-line
+# render matches it pixel for pixel. Fixed labels hit the cache and cost
+# one paste; lines carrying a fresh reading miss and cost a bit more than
+# a plain draw.text, since the bitmap is rendered and then pasted.
+
+
+@lru_cache(maxsize=64)
+def line_bitmap(font, text):
+    left, top, right, bottom = font.getbbox(text, mode="1")
+    bitmap = Image.new("1", (max(right - left, 1), max(bottom - top, 1)))
+    ImageDraw.Draw(bitmap).text((-left, -top), text, font=font, fill=255)
+    return bitmap, left, top
+
+
+def draw_text(image, font, xy, text):
+    bitmap, left, top = line_bitmap(font, text)
+    image.paste(255, (xy[0] + left, xy[1] + top), bitmap)
@@ -0,0 +1,21 @@
+#!/bin/sh
+# Enable the I2C bus at 400 kHz fast mode for the OLED, MLX90614 and
+# TCS34725. Run once with sudo, then reboot.
+set -e
+
+CONFIG=/boot/firmware/config.txt
+[ -f "$CONFIG" ] || CONFIG=/boot/config.txt
+
+# config.txt may end inside a conditional section such as [pi4] or [cm5];
+# [all] makes the appended settings apply whatever board this is.
+section_written=
+for line in "dtparam=i2c_arm=on" "dtparam=i2c_arm_baudrate=400000"; do
+    grep -qxF "$line" "$CONFIG" && continue
+    if [ -z "$section_written" ]; then
+        printf '\n[all]\n' >> "$CONFIG"
+        section_written=1
+    fi
+    echo "$line" >> "$CONFIG"
+done
+
+echo "Updated $CONFIG — reboot for the new I2C speed to take effect."
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Let the tests import the top-level scripts' helpers under plain `pytest`.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
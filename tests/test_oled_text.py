@@ -0,0 +1,40 @@
+import pytest
+from PIL import Image, ImageDraw, ImageFont
+
+from oled_text import draw_text
+
+font = ImageFont.load_default()
+
+# Every line menu.py puts on the OLED, with sample values for the
+# formatted ones (N/A fallbacks, "m/s", bracketed RGB tuples, negatives).
+MENU_LINES = [
+    "",
+    "Select Option:",
+    "Obj:23.4C Amb:21.9C",
+    "Obj:-1.5C Amb:-0.2C",
+    "Temp: N/A",
+    "Speed:344.3m/s RGB:(12, 200, 3)",
+    "Speed: N/A RGB:N/A",
+    "Speed:343.1m/s RGB:N/A",
+    "Waiting for button",
+    "Press to start test",
+    "Measuring...",
+    "Distance: 123.45 cm",
+    "Distance: N/A",
+    "Shape: Flat",
+    "Shape: Curved",
+    "Shape: Irregular",
+    "SD:2.31",
+    "Material: Absorbing",
+    "Material: Reflective",
+]
+
+
+@pytest.mark.parametrize("text", MENU_LINES)
+@pytest.mark.parametrize("y", [5, 25, 45])
+def test_draw_text_matches_imagedraw(text, y):
+    expected = Image.new("1", (128, 64))
+    ImageDraw.Draw(expected).text((0, y), text, font=font, fill=255)
+    actual = Image.new("1", (128, 64))
+    draw_text(actual, font, (0, y), text)
+    assert actual.tobytes() == expected.tobytes()